@@ -0,0 +1,81 @@
+"""
+Compiled ring orientation pass used by json2geo.fix_features_orientation()
+
+Imported lazily, only for inputs large enough to pay for loading NumPy and Numba.
+The kernels live at module level so Numba can reuse its on-disk cache.
+"""
+from typing import List, Sequence
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(cache=True)
+def _lowest_vertex_orientation(xs, ys, start, end):
+    """
+    Orientation of the ring stored in xs/ys[start:end], same rules as Ring.is_ccw():
+    Returns 1 if counterclockwise, -1 if clockwise, 0 if degenerate
+    """
+    n = end - start
+    if n and xs[start] == xs[end - 1] and ys[start] == ys[end - 1]:
+        n -= 1  # Ignore the closing point
+    if n < 3:
+        return 0
+
+    i_min = 0
+    for k in range(1, n):
+        y = ys[start + k]
+        y_min = ys[start + i_min]
+        if y < y_min or (y == y_min and xs[start + k] > xs[start + i_min]):
+            i_min = k
+    x_min = xs[start + i_min]
+    y_min = ys[start + i_min]
+
+    # Skip duplicated points next to the lowest vertex
+    i_prev = (i_min - 1 + n) % n
+    while i_prev != i_min and xs[start + i_prev] == x_min and ys[start + i_prev] == y_min:
+        i_prev = (i_prev - 1 + n) % n
+    i_next = (i_min + 1) % n
+    while i_next != i_min and xs[start + i_next] == x_min and ys[start + i_next] == y_min:
+        i_next = (i_next + 1) % n
+    if i_prev == i_min or i_next == i_min:
+        return 0
+
+    ax = xs[start + i_prev]
+    ay = ys[start + i_prev]
+    cross = ((x_min - ax) * (ys[start + i_next] - ay)
+             - (xs[start + i_next] - ax) * (y_min - ay))
+    if cross > 0:
+        return 1
+    if cross < 0:
+        return -1
+    return 0
+
+
+@njit(cache=True, parallel=True)
+def _rings_to_reverse(xs, ys, ring_offsets, expect_ccw):
+    """Flag rings whose stored order does not match expect_ccw, rings are spread over threads"""
+    n_rings = ring_offsets.shape[0] - 1
+    flags = np.zeros(n_rings, dtype=np.bool_)
+    for r in prange(n_rings):
+        orientation = _lowest_vertex_orientation(xs, ys, ring_offsets[r], ring_offsets[r + 1])
+        if expect_ccw[r]:
+            flags[r] = orientation < 0
+        else:
+            flags[r] = orientation > 0
+    return flags
+
+
+def rings_to_reverse(rings: Sequence, expect_ccw: List[bool]) -> List[int]:
+    """
+    Indices of the packed rings whose stored order does not match expect_ccw:
+    - The X and Y arrays of all rings are joined into two flat buffers
+    - The compiled kernel checks every ring in one pass
+    """
+    xs = np.frombuffer(b''.join([ring.xs for ring in rings]), dtype=np.float64)
+    ys = np.frombuffer(b''.join([ring.ys for ring in rings]), dtype=np.float64)
+    ring_offsets = np.zeros(len(rings) + 1, dtype=np.int64)
+    np.cumsum([len(ring.xs) for ring in rings], out=ring_offsets[1:])
+
+    flags = _rings_to_reverse(xs, ys, ring_offsets, np.asarray(expect_ccw, dtype=np.bool_))
+    return np.flatnonzero(flags).tolist()
@@ -1,9 +1,30 @@
 import json
 import argparse
+import itertools
+import mmap
+import os
+import stat
+from array import array
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Iterable, BinaryIO
 from enum import Flag, auto
 
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the standard library
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson is optional, fall back to loading the whole file
+    ijson = None
+
+# Inputs at least this large are streamed with ijson instead of loaded whole
+STREAM_MIN_BYTES = 256 * 1024 * 1024
+
+# Packed vertices needed before the compiled orientation pass pays for loading NumPy and Numba
+BULK_MIN_VERTICES = 10_000_000
+
 class GeometryTypes(Flag):
     """Binary flags for geometry types"""
     NONE = 0
@@ -17,6 +38,246 @@ class GeometryTypes(Flag):
     ALL = (POINT | LINESTRING | POLYGON | MULTIPOINT | 
            MULTILINESTRING | MULTIPOLYGON | GEOMETRYCOLLECTION)
 
+# GeoJSON spelling of each geometry type flag
+GEOJSON_TYPE_NAMES = {
+    'POINT': 'Point',
+    'LINESTRING': 'LineString',
+    'POLYGON': 'Polygon',
+    'MULTIPOINT': 'MultiPoint',
+    'MULTILINESTRING': 'MultiLineString',
+    'MULTIPOLYGON': 'MultiPolygon',
+    'GEOMETRYCOLLECTION': 'GeometryCollection',
+}
+
+class RingView:
+    """
+    Ring whose coordinates are emitted in reverse order when flagged:
+    - Reversing a ring only flips reversed_flag, the coordinates never move
+    - Indexing and iteration follow the flagged order
+    """
+    __slots__ = ('coords', 'reversed_flag')
+
+    def __init__(self, coords: List[List[float]], reversed_flag: bool = False):
+        self.coords = coords
+        self.reversed_flag = reversed_flag
+
+    def __len__(self) -> int:
+        return len(self.coords)
+
+    def __getitem__(self, index: int) -> List[float]:
+        if self.reversed_flag:
+            return self.coords[-1 - index]
+        return self.coords[index]
+
+    def __iter__(self):
+        if self.reversed_flag:
+            return reversed(self.coords)
+        return iter(self.coords)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (list, Ring, RingView)):
+            return list(self) == list(other)
+        return NotImplemented
+
+class Ring:
+    """
+    Polygon ring stored as separate X and Y coordinate arrays:
+    - Two packed double arrays instead of one list object per vertex
+    - Reversing only flips reversed_flag, like RingView
+    - Only all-float rings are packed, other rings stay plain lists
+    """
+    __slots__ = ('xs', 'ys', 'reversed_flag')
+
+    def __init__(self, xs: array, ys: array, reversed_flag: bool = False):
+        self.xs = xs
+        self.ys = ys
+        self.reversed_flag = reversed_flag
+
+    @classmethod
+    def from_positions(cls, positions: List[List[float]]) -> Optional['Ring']:
+        """
+        Build a Ring from [x, y] positions:
+        - None if any position is not 2D
+        - None if any coordinate is not a float, so ints are written back unchanged
+        """
+        if set(map(len, positions)) != {2}:
+            return None
+        xs, ys = zip(*positions)
+        if set(map(type, xs)) != {float} or set(map(type, ys)) != {float}:
+            return None
+        return cls(array('d', xs), array('d', ys))
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def __getitem__(self, index: int) -> List[float]:
+        if self.reversed_flag:
+            index = -1 - index
+        return [self.xs[index], self.ys[index]]
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (list, Ring, RingView)):
+            return self.tolist() == list(other)
+        return NotImplemented
+
+    def tolist(self) -> List[List[float]]:
+        """Positions as [x, y] lists in the flagged order"""
+        if self.reversed_flag:
+            return list(map(list, zip(reversed(self.xs), reversed(self.ys))))
+        return list(map(list, zip(self.xs, self.ys)))
+
+    def is_ccw(self) -> Optional[bool]:
+        """Orientation from the lowest vertex, same rules as ring_is_ccw()"""
+        xs, ys = self.xs, self.ys
+        n = len(xs)
+        if n and xs[0] == xs[-1] and ys[0] == ys[-1]:
+            n -= 1  # Ignore the closing point
+        if n < 3:
+            return None
+
+        y_min = min(ys)
+        i_min = ys.index(y_min)
+        if ys.count(y_min) > 1:
+            for k in range(i_min + 1, n):
+                if ys[k] == y_min and xs[k] > xs[i_min]:
+                    i_min = k
+        x_min = xs[i_min]
+
+        # Skip duplicated points next to the lowest vertex
+        i_prev = (i_min - 1) % n
+        while i_prev != i_min and xs[i_prev] == x_min and ys[i_prev] == y_min:
+            i_prev = (i_prev - 1) % n
+        i_next = (i_min + 1) % n
+        while i_next != i_min and xs[i_next] == x_min and ys[i_next] == y_min:
+            i_next = (i_next + 1) % n
+        if i_prev == i_min or i_next == i_min:
+            return None
+
+        ax, ay = xs[i_prev], ys[i_prev]
+        cross = ((x_min - ax) * (ys[i_next] - ay)
+                 - (xs[i_next] - ax) * (y_min - ay))
+        if cross == 0:
+            return None
+        # The stored arrays are in the opposite order when flagged
+        return (cross > 0) != self.reversed_flag
+
+def _polygon_polygons(geometry: Dict[str, Any]):
+    """The ring list of a Polygon"""
+    yield geometry['coordinates']
+
+def _multipolygon_polygons(geometry: Dict[str, Any]):
+    """The ring lists of every polygon of a MultiPolygon"""
+    yield from geometry['coordinates']
+
+def _collection_polygons(geometry: Dict[str, Any]):
+    """The ring lists of every polygon of the GeometryCollection members"""
+    for member in geometry.get('geometries') or ():
+        if member:
+            yield from iter_polygons(member)
+
+# Polygon iterator for each geometry type that can contain polygons
+_POLYGON_DISPATCH = {
+    'Polygon': _polygon_polygons,
+    'MultiPolygon': _multipolygon_polygons,
+    'GeometryCollection': _collection_polygons,
+}
+
+def iter_polygons(geometry: Dict[str, Any]):
+    """Yield the ring lists of every polygon in a geometry, including collection members"""
+    handler = _POLYGON_DISPATCH.get(geometry.get('type'))
+    return handler(geometry) if handler else iter(())
+
+def pack_geometry_rings(geometry: Dict[str, Any]) -> None:
+    """Replace 2D polygon rings of a geometry with Ring objects"""
+    for polygon in iter_polygons(geometry):
+        for k, positions in enumerate(polygon):
+            if isinstance(positions, list):
+                polygon[k] = Ring.from_positions(positions) or positions
+
+def reverse_ring(polygon: List[List[List[float]]], index: int) -> None:
+    """Reverse the ring polygon[index], wrapping plain lists in a flagged RingView"""
+    ring = polygon[index]
+    if isinstance(ring, (Ring, RingView)):
+        ring.reversed_flag = not ring.reversed_flag
+    else:
+        polygon[index] = RingView(ring, True)
+
+def encode_default(obj: Any) -> Any:
+    """
+    Serialize Ring and RingView objects as position lists:
+    - Pass as default= to json.dumps() or orjson.dumps() to encode parser features
+    """
+    if isinstance(obj, Ring):
+        return obj.tolist()
+    if isinstance(obj, RingView):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _dump_json(obj: Any) -> bytes:
+    """Serialize obj to indented UTF-8 JSON"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=encode_default, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, ensure_ascii=False, indent=2,
+                      default=encode_default).encode('utf-8')
+
+def _stream_write(output_path: str, features: List[Dict[str, Any]]) -> None:
+    """Write a FeatureCollection one feature at a time, laid out like indent=2"""
+    with open(output_path, 'wb') as f:
+        if not features:
+            f.write(b'{\n  "type": "FeatureCollection",\n  "features": []\n}')
+            return
+        f.write(b'{\n  "type": "FeatureCollection",\n  "features": [\n    ')
+        for i, feature in enumerate(features):
+            if i:
+                f.write(b',\n    ')
+            # JSON strings never hold raw newlines, so this only indents lines
+            f.write(_dump_json(feature).replace(b'\n', b'\n    '))
+        f.write(b'\n  ]\n}')
+
+def ring_is_ccw(ring: List[List[float]]) -> Optional[bool]:
+    """
+    Determine ring orientation from its lowest vertex:
+    - The lowest vertex (ties broken by largest X) is always on the convex hull
+    - The cross product of its two adjacent edges gives the orientation
+    Returns True if counterclockwise, False if clockwise, None if degenerate
+    """
+    if isinstance(ring, Ring):
+        return ring.is_ccw()
+
+    n = len(ring)
+    if n and ring[0] == ring[-1]:
+        n -= 1  # Ignore the closing point
+    if n < 3:
+        return None
+
+    i_min = 0
+    x_min, y_min = ring[0][0], ring[0][1]
+    for k in range(1, n):
+        x, y = ring[k][0], ring[k][1]
+        if y < y_min or (y == y_min and x > x_min):
+            i_min, x_min, y_min = k, x, y
+
+    # Skip duplicated points next to the lowest vertex
+    lowest = ring[i_min]
+    i_prev = (i_min - 1) % n
+    while i_prev != i_min and ring[i_prev] == lowest:
+        i_prev = (i_prev - 1) % n
+    i_next = (i_min + 1) % n
+    while i_next != i_min and ring[i_next] == lowest:
+        i_next = (i_next + 1) % n
+    if i_prev == i_min or i_next == i_min:
+        return None
+
+    ax, ay = ring[i_prev][0], ring[i_prev][1]
+    cross = ((x_min - ax) * (ring[i_next][1] - ay)
+             - (ring[i_next][0] - ax) * (y_min - ay))
+    if cross == 0:
+        return None
+    return cross > 0
+
 def fix_polygon_orientation(coordinates: List[List[float]]) -> bool:
     """
     Fix polygon ring orientation according to the right-hand rule:
@@ -24,56 +285,105 @@ def fix_polygon_orientation(coordinates: List[List[float]]) -> bool:
     - Interior rings (holes) should be clockwise
     Returns True if any changes were made
     """
-    def calculate_area(ring: List[List[float]]) -> float:
-        """Calculate the signed area of a ring"""
-        area = 0
-        for i in range(len(ring) - 1):
-            j = (i + 1)
-            area += ring[i][0] * ring[j][1]
-            area -= ring[j][0] * ring[i][1]
-        return area / 2
-
-    def reverse_ring(ring: List[List[float]]) -> None:
-        """Reverse the order of coordinates in a ring"""
-        ring.reverse()
+    if not coordinates:
+        return False
 
     changed = False
     # First ring is exterior (should be counterclockwise)
-    area = calculate_area(coordinates[0])
-    if area < 0:  # If clockwise, reverse it
-        reverse_ring(coordinates[0])
+    if ring_is_ccw(coordinates[0]) is False:  # If clockwise, reverse it
+        reverse_ring(coordinates, 0)
         changed = True
 
     # Other rings are interior (should be clockwise)
-    for ring in coordinates[1:]:
-        area = calculate_area(ring)
-        if area > 0:  # If counterclockwise, reverse it
-            reverse_ring(ring)
+    for k in range(1, len(coordinates)):
+        if ring_is_ccw(coordinates[k]):  # If counterclockwise, reverse it
+            reverse_ring(coordinates, k)
             changed = True
 
     return changed
 
 def fix_geometry_orientation(geometry: Dict[str, Any]) -> bool:
-    """Fix orientation of Polygons and MultiPolygons"""
-    if not geometry or 'type' not in geometry:
+    """Fix orientation of Polygons, MultiPolygons and GeometryCollection members"""
+    if not geometry:
         return False
-
     changed = False
-    if geometry['type'] == 'Polygon':
-        changed = fix_polygon_orientation(geometry['coordinates'])
-    elif geometry['type'] == 'MultiPolygon':
-        for polygon in geometry['coordinates']:
-            if fix_polygon_orientation(polygon):
-                changed = True
+    for polygon in iter_polygons(geometry):
+        if fix_polygon_orientation(polygon):
+            changed = True
     return changed
 
+def fix_features_orientation(features: List[Dict[str, Any]]) -> int:
+    """
+    Fix orientation of all features:
+    - Polygons with any ring that is not packed go through fix_polygon_orientation()
+    - Packed rings go through the compiled pass in _orient_kernel when there are at least
+      BULK_MIN_VERTICES vertices and NumPy and Numba are installed, else the same way
+    Returns the number of features that were changed
+    """
+    changed = set()
+    packed_polygons = []
+    vertex_count = 0
+    for idx, feature in enumerate(features):
+        geometry = feature.get('geometry')
+        if not geometry:
+            continue
+        for polygon in iter_polygons(geometry):
+            if polygon and all(isinstance(ring, Ring) for ring in polygon):
+                packed_polygons.append((idx, polygon))
+                vertex_count += sum(len(ring) for ring in polygon)
+            elif fix_polygon_orientation(polygon):
+                changed.add(idx)
+
+    rings_to_reverse = None
+    if vertex_count >= BULK_MIN_VERTICES:
+        try:
+            from _orient_kernel import rings_to_reverse
+        except ImportError:  # NumPy and Numba are optional, fall back to pure Python
+            pass
+
+    if rings_to_reverse is None:
+        for idx, polygon in packed_polygons:
+            if fix_polygon_orientation(polygon):
+                changed.add(idx)
+        return len(changed)
+
+    rings = []
+    locations = []
+    expect_ccw = []
+    owners = []
+    for idx, polygon in packed_polygons:
+        for k, ring in enumerate(polygon):
+            rings.append(ring)
+            locations.append((polygon, k))
+            # A flagged ring's stored order is the reverse of its current one
+            expect_ccw.append((k == 0) != ring.reversed_flag)
+            owners.append(idx)
+    for r in rings_to_reverse(rings, expect_ccw):
+        reverse_ring(*locations[r])
+        changed.add(owners[r])
+    return len(changed)
+
 class GeoJSONParser:
     def __init__(self, limit: int = None, require_geometry: bool = True, 
                  geometry_types: GeometryTypes = GeometryTypes.ALL):
+        # Polygon rings may be Ring or RingView objects, which compare equal to
+        # position lists; encode features with default=encode_default
         self.features: List[Dict[str, Any]] = []
+        self._count = 0
+        # Indices of stored features whose geometry can contain polygons
+        self._polygon_indices: List[int] = []
         self.limit = limit
         self.require_geometry = require_geometry
         self.geometry_types = geometry_types
+        # GeoJSON names of the accepted geometry types, plus lower-cased ones
+        # for inputs that do not use the standard spelling
+        self._accepted = frozenset(
+            GEOJSON_TYPE_NAMES[name] for name, flag in GeometryTypes.__members__.items()
+            if name in GEOJSON_TYPE_NAMES and self.geometry_types & flag)
+        self._accepted_ci = frozenset(name.lower() for name in self._accepted)
+        self._validate = (self._validate_with_geom if require_geometry
+                          else self._validate_no_geom)
+        self.fixed_count: Optional[int] = None
     
     def is_valid_geojson(self, data: Dict[str, Any]) -> bool:
         """Check if the data is valid GeoJSON"""
@@ -96,29 +406,38 @@ class GeoJSONParser:
     
     def is_valid_feature(self, feature: Dict[str, Any]) -> bool:
         """Check if a single feature is valid and matches selected geometry types"""
-        if not isinstance(feature, dict) or 'type' not in feature:
-            return False
-            
-        has_properties = 'properties' in feature
-        has_geometry = 'geometry' in feature and feature['geometry'] is not None
-        
-        if not has_properties or (self.require_geometry and not has_geometry):
+        return self._validate(feature)
+
+    def _check_feature(self, feature: Dict[str, Any], missing_geometry: bool) -> bool:
+        """Checks shared by both validators, missing_geometry is the result for features without geometry"""
+        if not isinstance(feature, dict) or 'type' not in feature or 'properties' not in feature:
             return False
-            
-        # If geometry is not required, accept features without geometry
-        if not has_geometry and not self.require_geometry:
-            return True
-            
-        # Check geometry type
-        geometry = feature['geometry']
+        geometry = feature.get('geometry')
+        if geometry is None:
+            return missing_geometry
         geometry_type = geometry['type']
-        
-        type_flag = getattr(GeometryTypes, geometry_type.upper(), GeometryTypes.NONE)
-        return bool(self.geometry_types & type_flag)
+        return geometry_type in self._accepted or geometry_type.lower() in self._accepted_ci
+
+    def _validate_with_geom(self, feature: Dict[str, Any]) -> bool:
+        """Validator used when features must have a geometry"""
+        return self._check_feature(feature, False)
+
+    def _validate_no_geom(self, feature: Dict[str, Any]) -> bool:
+        """Validator used when features without geometry are accepted"""
+        return self._check_feature(feature, True)
     
+    def add_feature(self, feature: Dict[str, Any]) -> None:
+        """Store a validated feature, packing its polygon rings into Ring objects"""
+        geometry = feature.get('geometry')
+        if geometry and geometry.get('type') in _POLYGON_DISPATCH:
+            pack_geometry_rings(geometry)
+            self._polygon_indices.append(len(self.features))
+        self.features.append(feature)
+        self._count += 1
+
     def extract_features(self, data: Dict[str, Any]) -> None:
         """Extract GeoJSON features from data"""
-        if self.limit and len(self.features) >= self.limit:
+        if self.limit and self._count >= self.limit:
             return
             
         if 'property_geojson' in data:
@@ -127,54 +446,87 @@ class GeoJSONParser:
                 return
                 
             if geojson_data['type'] == 'Feature':
-                if self.is_valid_feature(geojson_data):
-                    if not self.limit or len(self.features) < self.limit:
-                        self.features.append(geojson_data)
+                if self._validate(geojson_data):
+                    self.add_feature(geojson_data)
             elif geojson_data['type'] == 'FeatureCollection':
-                valid_features = [f for f in geojson_data['features'] if self.is_valid_feature(f)]
-                remaining = self.limit - len(self.features) if self.limit else None
-                if remaining is not None:
-                    self.features.extend(valid_features[:remaining])
-                else:
-                    self.features.extend(valid_features)
+                # Lazily validate so nothing past the limit is checked
+                needed = self.limit - self._count if self.limit else None
+                valid_features = filter(self._validate, geojson_data['features'])
+                for feature in itertools.islice(valid_features, needed):
+                    self.add_feature(feature)
     
+    def extract_items(self, items: Iterable[Dict[str, Any]]) -> None:
+        """Extract features from an iterable of data items, stopping at the limit"""
+        for item in items:
+            self.extract_features(item)
+            if self.limit and self._count >= self.limit:
+                break
+
+    def stream_file(self, f: BinaryIO) -> None:
+        """Stream data items from a binary file with ijson"""
+        # Hand the file itself to ijson so the C backend builds the items
+        items = ijson.items(f, 'data.item', use_float=True)
+        first = next(items, None)
+        if first is not None:
+            self.extract_items(itertools.chain([first], items))
+            return
+
+        # Nothing under 'data': either the array is empty or there is no envelope.
+        # Without an envelope the root is the single item, so it is built whole.
+        f.seek(0)
+        root = next(ijson.items(f, '', use_float=True), None)
+        if isinstance(root, dict) and 'data' in root:
+            return
+        self.extract_features(root)
+
     def parse_file(self, input_path: str) -> None:
         """Parse input file"""
+        self.fixed_count = None
         try:
-            with open(input_path, 'r', encoding='utf-8') as f:
-                json_data = json.load(f)
+            with open(input_path, 'rb') as f:
+                st = os.fstat(f.fileno())
+                if ijson is not None and st.st_size >= STREAM_MIN_BYTES:
+                    self.stream_file(f)
+                    return
+
+                if orjson is not None:
+                    if stat.S_ISREG(st.st_mode) and st.st_size > 0:
+                        # Parse the UTF-8 bytes straight from the page cache
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            with memoryview(mm) as view:
+                                json_data = orjson.loads(view)
+                    else:
+                        # Pipes and empty files cannot be mapped
+                        json_data = orjson.loads(f.read())
+                else:
+                    json_data = json.load(f)
                 
             if isinstance(json_data, dict) and 'data' in json_data:
-                for item in json_data['data']:
-                    if self.limit and len(self.features) >= self.limit:
-                        break
-                    self.extract_features(item)
+                self.extract_items(json_data['data'])
             else:
                 self.extract_features(json_data)
                 
         except Exception as e:
             print(f"Error parsing file: {str(e)}")
     
+    def fix_orientations(self) -> int:
+        """Fix polygon orientations once, returns the number of features changed"""
+        if self.fixed_count is None:
+            # Only polygonal features can need fixing, skip the rest entirely
+            polygons = [self.features[i] for i in self._polygon_indices]
+            self.fixed_count = fix_features_orientation(polygons)
+        return self.fixed_count
+
     def save_geojson(self, output_path: str) -> None:
         """Save to GeoJSON file"""
         try:
             # Fix polygon orientations before saving
-            fixed_count = 0
-            for feature in self.features:
-                if 'geometry' in feature and feature['geometry']:
-                    if fix_geometry_orientation(feature['geometry']):
-                        fixed_count += 1
-
-            feature_collection = {
-                "type": "FeatureCollection",
-                "features": self.features
-            }
-            
+            fixed_count = self.fix_orientations()
+
             output_dir = Path(output_path).parent
             output_dir.mkdir(parents=True, exist_ok=True)
             
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(feature_collection, f, ensure_ascii=False, indent=2)
+            _stream_write(output_path, self.features)
                 
             print(f"Successfully extracted {len(self.features)} features to {output_path}")
             if fixed_count > 0:
@@ -236,11 +588,7 @@ Examples:
     geojson_parser.parse_file(args.input)
     
     # Check and fix orientations before saving
-    fixed_count = 0
-    for feature in geojson_parser.features:
-        if 'geometry' in feature and feature['geometry']:
-            if fix_geometry_orientation(feature['geometry']):
-                fixed_count += 1
+    fixed_count = geojson_parser.fix_orientations()
     
     # Add orientation fix information to filename if needed
     if fixed_count > 0: